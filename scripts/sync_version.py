@@ -18,14 +18,50 @@ Usage:
 
 import argparse
 import json
+import mmap
+import os
 import re
 import sys
 from pathlib import Path
 from datetime import datetime, timezone
 
+try:
+    import orjson
+except ImportError:
+    # orjson is optional; the stdlib json module produces the same output
+    orjson = None
+
 # Get the root directory (parent of scripts folder)
 ROOT_DIR = Path(__file__).parent.parent
 
+# Records the mtime and version of each file after it was last synced, so
+# files that have not changed since can be skipped without reading them
+STATE_FILE = ROOT_DIR / ".sync_version_state.json"
+
+# Pre-compiled patterns used to rewrite version strings in each file.
+# They work on raw bytes so files are rewritten without decoding them.
+_CARGO_RE = re.compile(rb'(^\s*version\s*=\s*")[^"]*(")', re.MULTILINE)
+_NSI_RE = re.compile(rb'(!define AppVersion\s+")[^"]*(")')
+_MANIFEST_RE = re.compile(rb'(<assemblyIdentity\s+version=")[^"]*(")', re.MULTILINE)
+_HTML_RE = re.compile(rb'(<span class="version-pill">)v?[^<]*(</span>)')
+
+# Single alternation used to read version strings back in check_versions.
+# The named group that matched tells which file format was recognised.
+# It works on bytes so files can be searched through mmap without decoding.
+_CHECK_RE = re.compile(
+    rb'^\s*version\s*=\s*"(?P<cargo>[^"]*)"'
+    rb'|!define AppVersion\s+"(?P<nsi>[^"]*)"'
+    rb'|<assemblyIdentity\s+version="(?P<manifest>[^"]*)"'
+    rb'|<span class="version-pill">v?(?P<html>[^<]*)</span>',
+    re.MULTILINE
+)
+
+
+def is_valid_version(version: str) -> bool:
+    """Check that a version has the X.Y.Z format with numeric parts."""
+    parts = version.split('.')
+    return len(parts) == 3 and all(p.isascii() and p.isdigit() for p in parts)
+
 
 def read_version():
     """Read version from VERSION file."""
@@ -45,20 +81,19 @@ def write_version(version: str):
     print(f"[OK] Updated VERSION file to {version}")
 
 
-def update_cargo_toml(version: str) -> bool:
-    """Update version in Cargo.toml."""
-    file_path = ROOT_DIR / "Cargo.toml"
-    content = file_path.read_text()
-    
-    # Match version line in [package] section
-    pattern = r'(^\s*version\s*=\s*")[^"]*(")'
-    new_content = re.sub(pattern, rf'\g<1>{version}\2', content, count=1, flags=re.MULTILINE)
-    
-    if content != new_content:
-        file_path.write_text(new_content)
-        print(f"[OK] Updated Cargo.toml to {version}")
-        return True
-    return False
+def load_json(file_path: Path):
+    """Parse a JSON file, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(file_path.read_bytes())
+    return json.loads(file_path.read_text())
+
+
+def dump_json(file_path: Path, data):
+    """Write data as JSON indented by 2 spaces, using orjson when it is installed."""
+    if orjson is not None:
+        file_path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2) + b'\n')
+    else:
+        file_path.write_text(json.dumps(data, indent=2) + '\n')
 
 
 def update_latest_json(version: str) -> bool:
@@ -66,8 +101,7 @@ def update_latest_json(version: str) -> bool:
     file_path = ROOT_DIR / "latest.json"
     
     # Read existing data
-    with open(file_path, 'r') as f:
-        data = json.load(f)
+    data = load_json(file_path)
     
     # Update version and URL
     old_version = data.get('version', '')
@@ -76,9 +110,7 @@ def update_latest_json(version: str) -> bool:
     data['url'] = f"https://github.com/bayusegara27/blue-mancing/releases/download/v{version}/blue-mancing_{version}_x64-Setup.exe"
     
     # Write back
-    with open(file_path, 'w') as f:
-        json.dump(data, f, indent=2)
-        f.write('\n')
+    dump_json(file_path, data)
     
     if old_version != f"v{version}":
         print(f"[OK] Updated latest.json to v{version}")
@@ -86,81 +118,126 @@ def update_latest_json(version: str) -> bool:
     return False
 
 
-def update_installer_nsi(version: str) -> bool:
-    """Update version in installer.nsi."""
-    file_path = ROOT_DIR / "installer.nsi"
-    content = file_path.read_text()
+def _transactional_update(paths_and_patterns) -> list:
+    """Apply version substitutions to several files in one read pass and one write pass.
     
-    # Match the default AppVersion definition
-    pattern = r'(!define AppVersion\s+")[^"]*(")'
-    new_content = re.sub(pattern, rf'\g<1>{version}\2', content)
+    paths_and_patterns holds (relative path, compiled pattern, replacement,
+    count, shown version) tuples. Every file is read before any is written,
+    and only files whose content changed are written back.
     
-    if content != new_content:
-        file_path.write_text(new_content)
-        print(f"[OK] Updated installer.nsi to {version}")
-        return True
-    return False
-
-
-def update_manifest(version: str) -> bool:
-    """Update version in blue-mancing.manifest."""
-    file_path = ROOT_DIR / "blue-mancing.manifest"
-    content = file_path.read_text()
+    Returns the relative paths of the files that were updated.
+    """
+    # Read every file up front
+    contents = {}
+    for rel_path, *_ in paths_and_patterns:
+        contents[rel_path] = (ROOT_DIR / rel_path).read_bytes()
     
-    # Validate version format (must be X.Y.Z)
-    if not re.match(r'^\d+\.\d+\.\d+$', version):
-        print(f"WARNING: Invalid version format '{version}' for manifest. Expected X.Y.Z")
-        return False
+    # Apply all substitutions in memory
+    changed = []
+    for rel_path, pattern, replacement, count, shown_version in paths_and_patterns:
+        content = contents[rel_path]
+        new_content = pattern.sub(replacement, content, count=count)
+        if content != new_content:
+            contents[rel_path] = new_content
+            changed.append((rel_path, shown_version))
     
-    # Convert version to 4-part format (e.g., 2.0.0 -> 2.0.0.0)
-    version_parts = version.split('.')
-    version_parts.append('0')  # Add 4th part
-    manifest_version = '.'.join(version_parts)
+    # Write back only what changed
+    for rel_path, shown_version in changed:
+        (ROOT_DIR / rel_path).write_bytes(contents[rel_path])
+        print(f"[OK] Updated {rel_path} to {shown_version}")
     
-    # Match version attribute in assemblyIdentity tag specifically
-    # Use multiline pattern to match the version line within assemblyIdentity
-    pattern = r'(<assemblyIdentity\s+version=")[^"]*(")'
-    new_content = re.sub(pattern, rf'\g<1>{manifest_version}\2', content, flags=re.MULTILINE)
-    
-    if content != new_content:
-        file_path.write_text(new_content)
-        print(f"[OK] Updated blue-mancing.manifest to {manifest_version}")
-        return True
-    return False
+    return [rel_path for rel_path, _ in changed]
 
 
-def update_main_html(version: str) -> bool:
-    """Update version in html/main.html."""
-    file_path = ROOT_DIR / "html" / "main.html"
-    content = file_path.read_text()
-    
-    # Match version-pill span
-    pattern = r'(<span class="version-pill">)v?[^<]*(</span>)'
-    new_content = re.sub(pattern, rf'\g<1>v{version}\2', content)
-    
-    if content != new_content:
-        file_path.write_text(new_content)
-        print(f"[OK] Updated html/main.html to v{version}")
-        return True
-    return False
+def load_sync_state() -> dict:
+    """Load the per-file [mtime_ns, version] recorded by the last sync."""
+    try:
+        state = load_json(STATE_FILE)
+    except (OSError, ValueError):
+        return {}
+    return state if isinstance(state, dict) else {}
+
+
+def save_sync_state(state: dict):
+    """Save the per-file [mtime_ns, version] for the next sync."""
+    try:
+        dump_json(STATE_FILE, state)
+    except OSError as e:
+        print(f"WARNING: Could not write {STATE_FILE.name}: {e}")
+
+
+def is_synced(state: dict, rel_path: str, version: str) -> bool:
+    """Check if a file is unchanged since it was last synced to this version."""
+    try:
+        mtime_ns = (ROOT_DIR / rel_path).stat().st_mtime_ns
+    except OSError:
+        return False
+    return state.get(rel_path) == [mtime_ns, version]
+
+
+def record_sync(state: dict, rel_path: str, version: str):
+    """Remember that a file is now synced to this version."""
+    state[rel_path] = [(ROOT_DIR / rel_path).stat().st_mtime_ns, version]
 
 
 def sync_all(version: str):
-    """Sync version to all files."""
+    """Sync version to all files.
+    
+    Files that were synced to this version before and have not been
+    modified since are skipped without being read.
+    """
     print(f"\n[SYNC] Syncing version {version} to all files...\n")
     
     updated = []
+    skipped = []
+    state = load_sync_state()
+    
+    if is_synced(state, "latest.json", version):
+        skipped.append("latest.json")
+    else:
+        if update_latest_json(version):
+            updated.append("latest.json")
+        record_sync(state, "latest.json", version)
+    
+    version_bytes = version.encode('ascii')
+    paths_and_patterns = [
+        # Match version line in [package] section
+        ("Cargo.toml", _CARGO_RE, rb'\g<1>' + version_bytes + rb'\2', 1, version),
+        # Match the default AppVersion definition
+        ("installer.nsi", _NSI_RE, rb'\g<1>' + version_bytes + rb'\2', 0, version),
+    ]
     
-    if update_cargo_toml(version):
-        updated.append("Cargo.toml")
-    if update_latest_json(version):
-        updated.append("latest.json")
-    if update_installer_nsi(version):
-        updated.append("installer.nsi")
-    if update_manifest(version):
-        updated.append("blue-mancing.manifest")
-    if update_main_html(version):
-        updated.append("html/main.html")
+    # Validate version format (must be X.Y.Z)
+    if is_valid_version(version):
+        # Convert version to 4-part format (e.g., 2.0.0 -> 2.0.0.0)
+        manifest_version = f"{version}.0"
+        # Match version attribute in assemblyIdentity tag specifically
+        paths_and_patterns.append((
+            "blue-mancing.manifest", _MANIFEST_RE,
+            rb'\g<1>' + manifest_version.encode('ascii') + rb'\2', 0, manifest_version
+        ))
+    else:
+        print(f"WARNING: Invalid version format '{version}' for manifest. Expected X.Y.Z")
+    
+    # Match version-pill span
+    paths_and_patterns.append(
+        ("html/main.html", _HTML_RE, rb'\g<1>v' + version_bytes + rb'\2', 0, f"v{version}")
+    )
+    
+    pending = []
+    for entry in paths_and_patterns:
+        if is_synced(state, entry[0], version):
+            skipped.append(entry[0])
+        else:
+            pending.append(entry)
+    
+    updated.extend(_transactional_update(pending))
+    for rel_path, *_ in pending:
+        record_sync(state, rel_path, version)
+    save_sync_state(state)
+    
+    if skipped:
+        print(f"[SKIP] {len(skipped)} file(s) unchanged since last sync: {', '.join(skipped)}")
     
     if updated:
         print(f"\n[SUCCESS] Updated {len(updated)} file(s)")
@@ -170,6 +247,23 @@ def sync_all(version: str):
     return len(updated)
 
 
+def find_version(file_path: Path, kind: str):
+    """Return the first version string of the given kind found in a file.
+    
+    The file is memory-mapped and searched in place; only the matched
+    version is decoded.
+    """
+    with open(file_path, 'rb') as f:
+        # mmap refuses to map empty files
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for match in _CHECK_RE.finditer(mm):
+                if match.lastgroup == kind:
+                    return match.group(kind).decode('utf-8')
+    return None
+
+
 def check_versions():
     """Check if all versions are in sync."""
     version = read_version()
@@ -179,10 +273,8 @@ def check_versions():
     
     # Check Cargo.toml
     cargo_path = ROOT_DIR / "Cargo.toml"
-    cargo_content = cargo_path.read_text()
-    cargo_match = re.search(r'^\s*version\s*=\s*"([^"]*)"', cargo_content, re.MULTILINE)
-    if cargo_match:
-        cargo_version = cargo_match.group(1)
+    cargo_version = find_version(cargo_path, "cargo")
+    if cargo_version is not None:
         if cargo_version != version:
             errors.append(f"Cargo.toml: {cargo_version} (expected {version})")
         else:
@@ -190,8 +282,7 @@ def check_versions():
     
     # Check latest.json
     latest_path = ROOT_DIR / "latest.json"
-    with open(latest_path, 'r') as f:
-        latest_data = json.load(f)
+    latest_data = load_json(latest_path)
     latest_version = latest_data.get('version', '').lstrip('v')
     if latest_version != version:
         errors.append(f"latest.json: v{latest_version} (expected v{version})")
@@ -200,10 +291,8 @@ def check_versions():
     
     # Check installer.nsi
     nsi_path = ROOT_DIR / "installer.nsi"
-    nsi_content = nsi_path.read_text()
-    nsi_match = re.search(r'!define AppVersion\s+"([^"]*)"', nsi_content)
-    if nsi_match:
-        nsi_version = nsi_match.group(1)
+    nsi_version = find_version(nsi_path, "nsi")
+    if nsi_version is not None:
         if nsi_version != version:
             errors.append(f"installer.nsi: {nsi_version} (expected {version})")
         else:
@@ -211,11 +300,9 @@ def check_versions():
     
     # Check manifest
     manifest_path = ROOT_DIR / "blue-mancing.manifest"
-    manifest_content = manifest_path.read_text()
     # Match version in assemblyIdentity tag specifically
-    manifest_match = re.search(r'<assemblyIdentity\s+version="([^"]*)"', manifest_content)
-    if manifest_match:
-        manifest_version = manifest_match.group(1)
+    manifest_version = find_version(manifest_path, "manifest")
+    if manifest_version is not None:
         expected_manifest = version + ".0" if version.count('.') == 2 else version
         if not manifest_version.startswith(version):
             errors.append(f"blue-mancing.manifest: {manifest_version} (expected {expected_manifest})")
@@ -224,10 +311,8 @@ def check_versions():
     
     # Check main.html
     html_path = ROOT_DIR / "html" / "main.html"
-    html_content = html_path.read_text()
-    html_match = re.search(r'<span class="version-pill">v?([^<]*)</span>', html_content)
-    if html_match:
-        html_version = html_match.group(1)
+    html_version = find_version(html_path, "html")
+    if html_version is not None:
         if html_version != version:
             errors.append(f"html/main.html: v{html_version} (expected v{version})")
         else:
@@ -273,7 +358,7 @@ Examples:
         sys.exit(0 if success else 1)
     elif args.set:
         # Validate version format (only X.Y.Z supported)
-        if not re.match(r'^\d+\.\d+\.\d+$', args.set):
+        if not is_valid_version(args.set):
             print(f"ERROR: Invalid version format '{args.set}'.")
             print("Expected format: X.Y.Z (e.g., 2.1.0)")
             print("Note: Only basic three-part versions are supported.")
@@ -283,7 +368,7 @@ Examples:
     else:
         version = read_version()
         # Also validate version from file
-        if not re.match(r'^\d+\.\d+\.\d+$', version):
+        if not is_valid_version(version):
             print(f"ERROR: Invalid version in VERSION file: '{version}'")
             print("Expected format: X.Y.Z (e.g., 2.0.0)")
             sys.exit(1)
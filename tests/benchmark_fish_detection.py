@@ -12,16 +12,22 @@ This mirrors the Rust benchmark in tests/fish_detection_benchmark.rs and can be
 3. Tune the detection parameters
 
 Run with: python tests/benchmark_fish_detection.py
+     or: python tests/benchmark_fish_detection.py --full-sample-rate 1.0  # full image on every test
 """
 
+import argparse
+import io
+import json
 import os
 import sys
 import time
+import zipfile
 import cv2
 import numpy as np
 from pathlib import Path
 from typing import Optional, Tuple, Dict, List
 from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
 
 # Fish detection crop region constants - should match Rust image_service.rs
 # Based on benchmark analysis of test images, fish templates appear at:
@@ -32,6 +38,47 @@ FISH_CROP_Y_START = 0.65
 FISH_CROP_WIDTH = 0.30
 FISH_CROP_HEIGHT = 0.35
 
+# Per-pixel variance below which a window is considered flat (no texture to correlate)
+FLAT_WINDOW_EPSILON = 1e-3
+
+# Coarse-to-fine search: templates are first scored on an image downsampled
+# COARSE_PYRAMID_LEVELS times (16x fewer pixels at 2 levels), and at most
+# COARSE_MAX_CANDIDATES of those scoring within COARSE_SCORE_SLACK of the best
+# coarse score are rescored at full resolution
+COARSE_PYRAMID_LEVELS = 2
+COARSE_SCORE_SLACK = 0.15
+COARSE_MAX_CANDIDATES = 3
+
+# Full-resolution rescoring only searches this many coarse pixels around each
+# candidate's coarse match, to absorb the position error of downsampling
+REFINE_MARGIN = 2
+
+# Key holding the template folder signature inside the .npz template cache
+TEMPLATE_CACHE_SIGNATURE_KEY = "__signature__"
+
+# Templates correlated together in one batched FFT. Small batches keep the
+# intermediate arrays cache-sized; larger ones were slower on full images.
+TEMPLATE_BATCH_SIZE = 4
+
+# Fraction of test images also run without cropping. The full-image pass only
+# validates the crop region, so a sample of the images is enough by default.
+DEFAULT_FULL_SAMPLE_RATE = 0.2
+
+# Shared pool for scoring templates in parallel
+_MATCH_EXECUTOR = ThreadPoolExecutor(max_workers=os.cpu_count())
+
+
+def cuda_available() -> bool:
+    """Check whether OpenCV was built with CUDA and can see a device"""
+    try:
+        return cv2.cuda.getCudaEnabledDeviceCount() > 0
+    except (AttributeError, cv2.error):
+        return False
+
+
+# Full-resolution rescoring of unmasked templates runs on the GPU when possible
+USE_CUDA = cuda_available()
+
 @dataclass
 class DetectionResult:
     """Result of a single fish detection test"""
@@ -43,18 +90,112 @@ class DetectionResult:
     correct: bool
 
 
-def load_fish_templates(fish_folder: Path) -> Dict[str, Tuple[np.ndarray, Optional[np.ndarray]]]:
-    """Load all fish templates from a folder"""
+@dataclass
+class TemplateSpectra:
+    """Frequency-domain templates for one image shape, stacked for batched scoring
+    
+    Per-template data is stored as contiguous arrays indexed by template, in
+    the same order as names.
+    """
+    names: List[str]
+    weights_fft: np.ndarray   # (N, H, W//2+1) complex64, conj(rfft2) of zero-mean masked templates
+    mask_fft: np.ndarray      # (N, H, W//2+1) complex64, conj(rfft2) of binary masks
+    mask_count: np.ndarray    # (N,) float32, opaque pixels per mask
+    weights_norm: np.ndarray  # (N,) float32, L2 norm of each zero-mean masked template
+    valid_hw: np.ndarray      # (N, 2) int32, rows and columns of windows lying inside the image
+
+
+# Template spectra keyed by (pyramid level, image height, image width)
+SpectraCache = Dict[Tuple[int, int, int], TemplateSpectra]
+
+
+def read_image(path: Path, flags: int = cv2.IMREAD_COLOR) -> Optional[np.ndarray]:
+    """Read and decode an image file with a single read call"""
+    try:
+        buf = path.read_bytes()
+    except OSError:
+        return None
+    # imdecode asserts on an empty buffer instead of returning None like imread
+    if not buf:
+        return None
+    return cv2.imdecode(np.frombuffer(buf, np.uint8), flags)
+
+
+def template_signature(fish_folder: Path) -> List[str]:
+    """Describe the template PNGs in a folder by name, size and modification time"""
+    signature = []
+    for path in sorted(fish_folder.glob("*.png")):
+        stat = path.stat()
+        signature.append(f"{path.name}:{stat.st_size}:{stat.st_mtime_ns}")
+    return signature
+
+
+def load_template_cache(
+    cache_path: Path,
+    signature: List[str]
+) -> Optional[Dict[str, Tuple[np.ndarray, Optional[np.ndarray]]]]:
+    """Load processed templates from an .npz cache if it matches the signature"""
+    try:
+        with np.load(cache_path) as data:
+            if data[TEMPLATE_CACHE_SIGNATURE_KEY].tolist() != signature:
+                return None
+            
+            templates = {}
+            for key in data.files:
+                if not key.endswith("__gray"):
+                    continue
+                fish_name = key[:-len("__gray")]
+                mask_key = f"{fish_name}__mask"
+                mask = data[mask_key] if mask_key in data.files else None
+                templates[fish_name] = (data[key], mask)
+            return templates
+    except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+        return None
+
+
+def save_template_cache(
+    cache_path: Path,
+    signature: List[str],
+    templates: Dict[str, Tuple[np.ndarray, Optional[np.ndarray]]]
+):
+    """Save processed templates to an .npz cache, tagged with the folder signature"""
+    arrays = {TEMPLATE_CACHE_SIGNATURE_KEY: np.array(signature, dtype=str)}
+    for fish_name, (gray, mask) in templates.items():
+        arrays[f"{fish_name}__gray"] = gray
+        if mask is not None:
+            arrays[f"{fish_name}__mask"] = mask
+    
+    try:
+        np.savez_compressed(cache_path, **arrays)
+    except OSError as e:
+        print(f"  Could not write template cache {cache_path}: {e}")
+
+
+def load_fish_templates(
+    fish_folder: Path,
+    cache_path: Optional[Path] = None
+) -> Dict[str, Tuple[np.ndarray, Optional[np.ndarray]]]:
+    """Load all fish templates from a folder
+    
+    When cache_path is given, the processed templates are reused from that
+    .npz file as long as no PNG in the folder was added, removed or modified.
+    """
     templates = {}
     
     if not fish_folder.exists():
         return templates
     
+    if cache_path is not None:
+        signature = template_signature(fish_folder)
+        cached = load_template_cache(cache_path, signature)
+        if cached is not None:
+            return cached
+    
     for path in fish_folder.glob("*.png"):
         fish_name = path.stem
         
         # Load template with alpha channel
-        template_img = cv2.imread(str(path), cv2.IMREAD_UNCHANGED)
+        template_img = read_image(path, cv2.IMREAD_UNCHANGED)
         if template_img is None:
             continue
         
@@ -76,62 +217,354 @@ def load_fish_templates(fish_folder: Path) -> Dict[str, Tuple[np.ndarray, Option
         else:
             templates[fish_name] = (template_img, None)
     
+    if cache_path is not None:
+        save_template_cache(cache_path, signature, templates)
+    
     return templates
 
 
-def find_best_matching_fish(
-    img: np.ndarray,
+def load_template_hits(hits_path: Path) -> Dict[str, int]:
+    """Load how often each template won in previous benchmark runs"""
+    try:
+        data = json.loads(hits_path.read_text())
+    except (OSError, ValueError):
+        return {}
+    
+    if not isinstance(data, dict):
+        return {}
+    return {name: count for name, count in data.items() if isinstance(count, int)}
+
+
+def save_template_hits(hits_path: Path, hits: Dict[str, int]):
+    """Save per-template win counts for ordering templates in later runs"""
+    try:
+        hits_path.write_text(json.dumps(hits, indent=2, sort_keys=True) + "\n")
+    except OSError as e:
+        print(f"  Could not write template hits {hits_path}: {e}")
+
+
+def upload_gpu_templates(
+    templates: Dict[str, Tuple[np.ndarray, Optional[np.ndarray]]]
+) -> Dict[str, "cv2.cuda.GpuMat"]:
+    """Upload templates to the GPU once so every match can reuse them
+    
+    cv2.cuda template matching has no mask support, so only unmasked
+    templates are uploaded; masked ones are always matched on the CPU.
+    """
+    gpu_templates = {}
+    if not USE_CUDA:
+        return gpu_templates
+    
+    for fish_name, (template, mask) in templates.items():
+        if mask is None:
+            template_gpu = cv2.cuda_GpuMat()
+            template_gpu.upload(template)
+            gpu_templates[fish_name] = template_gpu
+    return gpu_templates
+
+
+def pyr_down(img: np.ndarray, levels: int) -> np.ndarray:
+    """Downsample an image by 2x per pyramid level"""
+    for _ in range(levels):
+        img = cv2.pyrDown(img)
+    return img
+
+
+def compute_template_spectra(
     templates: Dict[str, Tuple[np.ndarray, Optional[np.ndarray]]],
-    use_cropping: bool = True
-) -> Tuple[Optional[str], float, float]:
-    """Find best matching fish in a grayscale image using template matching"""
-    start_time = time.time()
+    image_shape: Tuple[int, int],
+    pyramid_level: int = 0
+) -> TemplateSpectra:
+    """Precompute template FFTs for correlating against images of a given shape
+    
+    Templates and masks are first downsampled to pyramid_level so they can be
+    matched against an image reduced with pyr_down by the same amount.
+    """
+    names = []
+    weights_ffts = []
+    mask_ffts = []
+    mask_counts = []
+    weights_norms = []
+    valid_hw = []
     
+    for fish_name, (template, mask) in templates.items():
+        if pyramid_level > 0:
+            template = pyr_down(template, pyramid_level)
+            if mask is not None:
+                # Re-binarize the blurred mask, keeping pixels that were mostly opaque
+                _, mask = cv2.threshold(pyr_down(mask, pyramid_level), 127, 255, cv2.THRESH_BINARY)
+        
+        # Templates that don't fit are skipped at match time
+        if template.shape[0] >= image_shape[0] or template.shape[1] >= image_shape[1]:
+            continue
+        
+        # Binary mask, same as cv2.matchTemplate does with 8-bit masks
+        if mask is not None:
+            mask_f = (mask > 0).astype(np.float64)
+        else:
+            mask_f = np.ones(template.shape, dtype=np.float64)
+        
+        mask_count = float(mask_f.sum())
+        if mask_count == 0:
+            continue
+        
+        # Zero-mean template restricted to the mask (TM_CCOEFF_NORMED numerator)
+        template_f = template.astype(np.float64)
+        template_mean = float((template_f * mask_f).sum()) / mask_count
+        weights = mask_f * (template_f - template_mean)
+        weights_norm = float(np.sqrt((weights * weights).sum()))
+        if weights_norm == 0:
+            continue
+        
+        names.append(fish_name)
+        weights_ffts.append(np.conj(np.fft.rfft2(weights.astype(np.float32), s=image_shape)))
+        mask_ffts.append(np.conj(np.fft.rfft2(mask_f.astype(np.float32), s=image_shape)))
+        mask_counts.append(mask_count)
+        weights_norms.append(weights_norm)
+        # Circular correlation wraps around past the last full window
+        valid_hw.append((image_shape[0] - template.shape[0] + 1, image_shape[1] - template.shape[1] + 1))
+    
+    spectrum_shape = (0, image_shape[0], image_shape[1] // 2 + 1)
+    return TemplateSpectra(
+        names=names,
+        weights_fft=np.stack(weights_ffts) if names else np.zeros(spectrum_shape, np.complex64),
+        mask_fft=np.stack(mask_ffts) if names else np.zeros(spectrum_shape, np.complex64),
+        mask_count=np.array(mask_counts, dtype=np.float32),
+        weights_norm=np.array(weights_norms, dtype=np.float32),
+        valid_hw=np.array(valid_hw, dtype=np.int32).reshape(-1, 2)
+    )
+
+
+def crop_fish_region(img: np.ndarray) -> np.ndarray:
+    """Crop an image to the fish result region"""
     h, w = img.shape[:2]
     
-    # Convert to grayscale if needed
-    if len(img.shape) == 3:
-        img_gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-    else:
-        img_gray = img
-    
-    # Optionally crop the image to the fish result region
-    if use_cropping:
-        crop_x1 = int(w * FISH_CROP_X_START)
-        crop_y1 = int(h * FISH_CROP_Y_START)
-        crop_w = int(w * FISH_CROP_WIDTH)
-        crop_h = int(h * FISH_CROP_HEIGHT)
+    crop_x1 = int(w * FISH_CROP_X_START)
+    crop_y1 = int(h * FISH_CROP_Y_START)
+    crop_w = int(w * FISH_CROP_WIDTH)
+    crop_h = int(h * FISH_CROP_HEIGHT)
+    
+    # Ensure crop region doesn't exceed image boundaries
+    crop_w = min(crop_w, w - crop_x1)
+    crop_h = min(crop_h, h - crop_y1)
+    
+    return img[crop_y1:crop_y1+crop_h, crop_x1:crop_x1+crop_w]
+
+
+def score_template_batch(
+    img_fft: np.ndarray,
+    img_sq_fft: np.ndarray,
+    spectra: TemplateSpectra,
+    batch: slice,
+    shape: Tuple[int, int]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Return the best masked TM_CCOEFF_NORMED score of a batch of templates
+    
+    All templates in the batch are correlated with one batched inverse FFT.
+    Returns the best score of each template and the (y, x) top-left corner
+    of its best window, as (n,) and (n, 2) arrays.
+    """
+    mask_fft = spectra.mask_fft[batch]
+    
+    # One batched inverse FFT per term for the whole batch
+    numerators = np.fft.irfft2(img_fft * spectra.weights_fft[batch], s=shape)
+    window_sums = np.fft.irfft2(img_fft * mask_fft, s=shape)
+    window_sq_sums = np.fft.irfft2(img_sq_fft * mask_fft, s=shape)
+    
+    indices = range(*batch.indices(len(spectra.names)))
+    best_scores = np.zeros(len(indices), dtype=np.float32)
+    locations = np.zeros((len(indices), 2), dtype=np.int64)
+    
+    for i, index in enumerate(indices):
+        valid_h, valid_w = spectra.valid_hw[index]
+        mask_count = spectra.mask_count[index]
+        numerator = numerators[i, :valid_h, :valid_w]
+        window_sum = window_sums[i, :valid_h, :valid_w]
+        window_var = window_sq_sums[i, :valid_h, :valid_w] - window_sum * window_sum / mask_count
         
-        # Ensure crop region doesn't exceed image boundaries
-        crop_w = min(crop_w, w - crop_x1)
-        crop_h = min(crop_h, h - crop_y1)
+        # Masked NCC: sum(T'*I) / sqrt(sum(T'^2) * sum(M*(I - mean_M(I))^2))
+        # Flat windows have no defined correlation; treat them as no match
+        denominator = np.sqrt(np.maximum(window_var, 0.0)) * spectra.weights_norm[index]
+        flat = window_var <= FLAT_WINDOW_EPSILON * mask_count
+        scores = numerator / np.where(flat, 1.0, denominator)
+        scores[flat] = 0.0
         
-        img_to_process = img_gray[crop_y1:crop_y1+crop_h, crop_x1:crop_x1+crop_w]
+        best = np.unravel_index(int(np.argmax(scores)), scores.shape)
+        best_scores[i] = scores[best]
+        locations[i] = best
+    
+    return best_scores, locations
+
+
+def match_template_cuda(img: np.ndarray, template_gpu: "cv2.cuda.GpuMat") -> float:
+    """Return the best unmasked TM_CCOEFF_NORMED score of a GPU-resident template
+    
+    Each call runs on its own CUDA stream so matches issued from the thread
+    pool overlap, and waits for it only before reading the result back.
+    """
+    stream = cv2.cuda_Stream()
+    img_gpu = cv2.cuda_GpuMat()
+    img_gpu.upload(img, stream)
+    
+    matcher = cv2.cuda.createTemplateMatching(cv2.CV_8UC1, cv2.TM_CCOEFF_NORMED)
+    result_gpu = matcher.match(img_gpu, template_gpu, stream=stream)
+    stream.waitForCompletion()
+    
+    _, max_val, _, _ = cv2.cuda.minMaxLoc(result_gpu)
+    return float(max_val)
+
+
+def refine_template_score(
+    img: np.ndarray,
+    template: np.ndarray,
+    mask: Optional[np.ndarray],
+    location: Optional[Tuple[int, int]],
+    margin: int,
+    template_gpu: Optional["cv2.cuda.GpuMat"] = None
+) -> float:
+    """Score a template at full resolution within margin pixels of a location
+    
+    location is the estimated (y, x) top-left corner of the match; when it is
+    None the whole image is searched. When template_gpu holds the template
+    already uploaded to the GPU, the match runs there instead.
+    """
+    th, tw = template.shape[:2]
+    
+    if location is not None:
+        y, x = location
+        y1 = max(y - margin, 0)
+        x1 = max(x - margin, 0)
+        img = img[y1:min(y + margin + th, img.shape[0]), x1:min(x + margin + tw, img.shape[1])]
+    
+    if img.shape[0] < th or img.shape[1] < tw:
+        return 0.0
+    
+    if template_gpu is not None and mask is None:
+        return match_template_cuda(np.ascontiguousarray(img), template_gpu)
+    
+    if mask is not None:
+        result = cv2.matchTemplate(img, template, cv2.TM_CCOEFF_NORMED, mask=mask)
     else:
-        img_to_process = img_gray
+        result = cv2.matchTemplate(img, template, cv2.TM_CCOEFF_NORMED)
     
-    best_fish = None
-    best_score = 0.0
+    # Flat windows come back as NaN/inf with a mask; treat them as no match
+    result = np.nan_to_num(result, nan=0.0, posinf=0.0, neginf=0.0)
+    return float(result.max())
+
+
+def score_templates(
+    img: np.ndarray,
+    templates: Dict[str, Tuple[np.ndarray, Optional[np.ndarray]]],
+    spectra_cache: SpectraCache,
+    pyramid_level: int = 0
+) -> Dict[str, Tuple[float, Tuple[int, int]]]:
+    """Score templates against an image already reduced to pyramid_level
+    
+    Returns each template's best score and the (y, x) location of its best
+    window. Templates that don't fit the image are left out of the result.
+    """
+    shape = img.shape[:2]
+    key = (pyramid_level, shape[0], shape[1])
+    if key not in spectra_cache:
+        spectra_cache[key] = compute_template_spectra(templates, shape, pyramid_level)
+    spectra = spectra_cache[key]
+    
+    # Image FFTs are computed once and shared by all templates. Single precision
+    # matches cv2.matchTemplate's CV_32F output; removing the mean first keeps
+    # the squared sums small enough that window variances don't cancel out.
+    img_f = img.astype(np.float32)
+    img_f -= img_f.mean()
+    img_fft = np.fft.rfft2(img_f)
+    img_sq_fft = np.fft.rfft2(img_f * img_f)
+    
+    # Score the stacked templates in small batches; numpy releases the GIL in
+    # the FFTs so batches are scored concurrently
+    count = len(spectra.names)
+    batches = [slice(i, i + TEMPLATE_BATCH_SIZE) for i in range(0, count, TEMPLATE_BATCH_SIZE)]
+    results = list(_MATCH_EXECUTOR.map(
+        lambda batch: score_template_batch(img_fft, img_sq_fft, spectra, batch, shape), batches
+    ))
+    
+    scores = {}
+    for batch, (best_scores, locations) in zip(batches, results):
+        for fish_name, score, (y, x) in zip(spectra.names[batch], best_scores, locations):
+            scores[fish_name] = (float(score), (int(y), int(x)))
+    return scores
+
+
+def find_best_matching_fish(
+    img_to_process: np.ndarray,
+    templates: Dict[str, Tuple[np.ndarray, Optional[np.ndarray]]],
+    spectra_cache: Optional[SpectraCache] = None,
+    gpu_templates: Optional[Dict[str, "cv2.cuda.GpuMat"]] = None
+) -> Tuple[Optional[str], float, float]:
+    """Find best matching fish in a grayscale image using template matching
     
-    for fish_name, (template, mask) in templates.items():
+    The image must already be grayscale, and cropped with crop_fish_region
+    when only the fish result region should be searched.
+    
+    Every template is first scored on a downsampled copy of the image with
+    masked TM_CCOEFF_NORMED, computed in the frequency domain so the image FFT
+    is shared by every template. Template FFTs depend on the image shape and
+    are kept in spectra_cache between calls.
+    
+    Only the top COARSE_MAX_CANDIDATES templates within COARSE_SCORE_SLACK of
+    the best coarse score are rescored at full resolution, and only in a small
+    window around where their coarse match was found. Templates present in
+    gpu_templates (see upload_gpu_templates) are rescored on the GPU.
+    """
+    start_time = time.time()
+    
+    if spectra_cache is None:
+        spectra_cache = {}
+    if gpu_templates is None:
+        gpu_templates = {}
+    
+    h, w = img_to_process.shape[:2]
+    coarse_scores = score_templates(
+        pyr_down(img_to_process, COARSE_PYRAMID_LEVELS), templates, spectra_cache,
+        pyramid_level=COARSE_PYRAMID_LEVELS
+    )
+    coarse_best = max((score for score, _ in coarse_scores.values()), default=0.0)
+    
+    scale = 2 ** COARSE_PYRAMID_LEVELS
+    candidates = []
+    ranked = []
+    for fish_name, (template, _) in templates.items():
         # Skip if template is larger than image
-        if template.shape[0] >= img_to_process.shape[0] or template.shape[1] >= img_to_process.shape[1]:
+        if template.shape[0] >= h or template.shape[1] >= w:
             continue
         
-        # Perform template matching
-        try:
-            if mask is not None:
-                result = cv2.matchTemplate(img_to_process, template, cv2.TM_CCOEFF_NORMED, mask=mask)
-            else:
-                result = cv2.matchTemplate(img_to_process, template, cv2.TM_CCOEFF_NORMED)
-            
-            _, max_val, _, _ = cv2.minMaxLoc(result)
-            
-            if max_val > best_score:
-                best_score = max_val
-                best_fish = fish_name
-        except cv2.error:
+        # Templates with no coarse score (e.g. the mask vanished when
+        # downsampled) are searched over the whole image
+        if fish_name not in coarse_scores:
+            candidates.append((fish_name, None))
             continue
+        
+        coarse_score, (y, x) = coarse_scores[fish_name]
+        if coarse_score >= coarse_best - COARSE_SCORE_SLACK:
+            ranked.append((coarse_score, fish_name, (y * scale, x * scale)))
+    
+    # Keep only the best few coarse matches for full-resolution rescoring
+    ranked.sort(key=lambda item: item[0], reverse=True)
+    candidates.extend((fish_name, location) for _, fish_name, location in ranked[:COARSE_MAX_CANDIDATES])
+    
+    margin = REFINE_MARGIN * scale
+    fine_scores = _MATCH_EXECUTOR.map(
+        lambda candidate: refine_template_score(
+            img_to_process, *templates[candidate[0]], candidate[1], margin,
+            template_gpu=gpu_templates.get(candidate[0])
+        ),
+        candidates
+    )
+    
+    best_fish = None
+    best_score = 0.0
+    
+    for (fish_name, _), max_val in zip(candidates, fine_scores):
+        if max_val > best_score:
+            best_score = max_val
+            best_fish = fish_name
     
     detection_time = (time.time() - start_time) * 1000  # Convert to ms
     return best_fish, best_score, detection_time
@@ -145,6 +578,31 @@ def extract_expected_fish_name(filename: str) -> Optional[str]:
     return filename.replace("_test_1920x1080.png", "")
 
 
+def run_detection(
+    filename: str,
+    expected_fish: str,
+    img_to_process: np.ndarray,
+    templates: Dict[str, Tuple[np.ndarray, Optional[np.ndarray]]],
+    spectra_cache: SpectraCache,
+    gpu_templates: Optional[Dict[str, "cv2.cuda.GpuMat"]] = None
+) -> DetectionResult:
+    """Run detection on one prepared test image and record the outcome"""
+    detected_fish, confidence, detection_time = find_best_matching_fish(
+        img_to_process, templates, spectra_cache=spectra_cache, gpu_templates=gpu_templates
+    )
+    
+    correct = detected_fish == expected_fish if detected_fish else False
+    
+    return DetectionResult(
+        test_image=filename,
+        expected_fish=expected_fish,
+        detected_fish=detected_fish,
+        confidence=confidence,
+        detection_time_ms=detection_time,
+        correct=correct
+    )
+
+
 def find_project_root() -> Path:
     """Find the project root directory by looking for Cargo.toml"""
     current = Path(__file__).resolve().parent
@@ -156,14 +614,20 @@ def find_project_root() -> Path:
     return Path(__file__).resolve().parent.parent
 
 
-def run_benchmark():
-    """Run the fish detection benchmark"""
+def run_benchmark(full_sample_rate: float = DEFAULT_FULL_SAMPLE_RATE):
+    """Run the fish detection benchmark
+    
+    Every test image is run with cropping; only a full_sample_rate fraction
+    of them, spread evenly over the run, is also run on the full image.
+    """
     print("\n========== FISH DETECTION BENCHMARK (Python) ==========\n")
     
     # Define paths relative to project root
     base_dir = find_project_root()
     test_images_dir = base_dir / "tests" / "assets" / "1920x1080"
     fish_templates_dir = base_dir / "images" / "1920x1080" / "fish"
+    template_cache_path = base_dir / "tests" / "assets" / ".fish_templates_cache.npz"
+    template_hits_path = base_dir / "tests" / "assets" / ".template_hits.json"
     
     # Check if directories exist
     if not test_images_dir.exists():
@@ -179,10 +643,24 @@ def run_benchmark():
     # Load all fish templates
     print(f"Loading fish templates from {fish_templates_dir}...")
     templates_start = time.time()
-    templates = load_fish_templates(fish_templates_dir)
+    templates = load_fish_templates(fish_templates_dir, cache_path=template_cache_path)
     templates_load_time = (time.time() - templates_start) * 1000
     print(f"Loaded {len(templates)} templates in {templates_load_time:.2f}ms\n")
     
+    # Try the templates that won most often in previous runs first
+    template_hits = load_template_hits(template_hits_path)
+    templates = dict(sorted(
+        templates.items(), key=lambda item: template_hits.get(item[0], 0), reverse=True
+    ))
+    
+    # Template FFTs per image shape, shared across all test images
+    spectra_cache: SpectraCache = {}
+    
+    # Templates kept on the GPU for the whole run (empty without CUDA)
+    gpu_templates = upload_gpu_templates(templates)
+    if USE_CUDA:
+        print(f"CUDA enabled: {len(gpu_templates)} unmasked template(s) on the GPU\n")
+    
     # List available templates
     print("Available templates:")
     for name in sorted(templates.keys()):
@@ -193,15 +671,16 @@ def run_benchmark():
     test_images = list(test_images_dir.glob("*.png"))
     print(f"Found {len(test_images)} test images\n")
     
-    # Run detection tests WITH cropping (optimized)
-    print("========== TEST WITH CROPPING (OPTIMIZED) ==========\n")
+    # Run detection with and without cropping in a single pass, so each test
+    # image is read, converted and has its expected name parsed only once
     results_cropped: List[DetectionResult] = []
+    results_full: List[DetectionResult] = []
     
-    for path in test_images:
+    for index, path in enumerate(test_images):
         filename = path.name
         
         # Load test image
-        img = cv2.imread(str(path))
+        img = read_image(path)
         if img is None:
             print(f"  Failed to load {filename}")
             continue
@@ -209,23 +688,35 @@ def run_benchmark():
         # Extract expected fish name
         expected_fish = extract_expected_fish_name(filename) or "unknown"
         
-        # Run detection with cropping
-        detected_fish, confidence, detection_time = find_best_matching_fish(img, templates, use_cropping=True)
-        
-        correct = detected_fish == expected_fish if detected_fish else False
-        
-        results_cropped.append(DetectionResult(
-            test_image=filename,
-            expected_fish=expected_fish,
-            detected_fish=detected_fish,
-            confidence=confidence,
-            detection_time_ms=detection_time,
-            correct=correct
+        # Run detection with cropping (optimized). Cropping the BGR image first
+        # means only the crop region (about a tenth of the pixels) is converted.
+        results_cropped.append(run_detection(
+            filename, expected_fish, cv2.cvtColor(crop_fish_region(img), cv2.COLOR_BGR2GRAY),
+            templates, spectra_cache, gpu_templates
         ))
+        
+        # Run detection WITHOUT cropping (full image) on a sample of the images,
+        # whenever the running count of sampled images reaches a new integer.
+        # Only these images need a full grayscale conversion.
+        if int((index + 1) * full_sample_rate) > int(index * full_sample_rate):
+            results_full.append(run_detection(
+                filename, expected_fish, cv2.cvtColor(img, cv2.COLOR_BGR2GRAY),
+                templates, spectra_cache, gpu_templates
+            ))
+    
+    # Record which templates won for the next run's ordering
+    for result in results_cropped:
+        if result.detected_fish:
+            template_hits[result.detected_fish] = template_hits.get(result.detected_fish, 0) + 1
+    save_template_hits(template_hits_path, template_hits)
+    
+    print("========== TEST WITH CROPPING (OPTIMIZED) ==========\n")
     
     # Print results with cropping
-    print(f"{'Test Image':<45} | {'Expected':<25} | {'Detected':<25} | {'Score':>8} | {'Time (ms)':>10}")
-    print("-" * 125)
+    # Render the table into a buffer and write it to stdout in one call
+    buf = io.StringIO()
+    buf.write(f"{'Test Image':<45} | {'Expected':<25} | {'Detected':<25} | {'Score':>8} | {'Time (ms)':>10}\n")
+    buf.write("-" * 125 + "\n")
     
     correct_count = 0
     total_time = 0.0
@@ -234,7 +725,7 @@ def run_benchmark():
         status = "✓" if result.correct else "✗"
         detected = result.detected_fish or "NONE"
         
-        print(f"{status} {result.test_image:<42} | {result.expected_fish:<25} | {detected:<25} | {result.confidence:>7.3f} | {result.detection_time_ms:>10.2f}")
+        buf.write(f"{status} {result.test_image:<42} | {result.expected_fish:<25} | {detected:<25} | {result.confidence:>7.3f} | {result.detection_time_ms:>10.2f}\n")
         
         if result.correct:
             correct_count += 1
@@ -243,42 +734,22 @@ def run_benchmark():
     accuracy = (correct_count / len(results_cropped)) * 100 if results_cropped else 0
     avg_time = total_time / len(results_cropped) if results_cropped else 0
     
-    print(f"\n{'=' * 125}")
-    print("RESULTS WITH CROPPING:")
-    print(f"  Accuracy: {correct_count}/{len(results_cropped)} ({accuracy:.1f}%)")
-    print(f"  Average detection time: {avg_time:.2f}ms")
-    print(f"  Total detection time: {total_time:.2f}ms")
+    buf.write(f"\n{'=' * 125}\n")
+    buf.write("RESULTS WITH CROPPING:\n")
+    buf.write(f"  Accuracy: {correct_count}/{len(results_cropped)} ({accuracy:.1f}%)\n")
+    buf.write(f"  Average detection time: {avg_time:.2f}ms\n")
+    buf.write(f"  Total detection time: {total_time:.2f}ms\n")
+    sys.stdout.write(buf.getvalue())
+    sys.stdout.flush()
     
-    # Run detection tests WITHOUT cropping (full image)
     print("\n\n========== TEST WITHOUT CROPPING (FULL IMAGE) ==========\n")
-    results_full: List[DetectionResult] = []
-    
-    for path in test_images:
-        filename = path.name
-        
-        img = cv2.imread(str(path))
-        if img is None:
-            continue
-        
-        expected_fish = extract_expected_fish_name(filename) or "unknown"
-        
-        # Run detection WITHOUT cropping
-        detected_fish, confidence, detection_time = find_best_matching_fish(img, templates, use_cropping=False)
-        
-        correct = detected_fish == expected_fish if detected_fish else False
-        
-        results_full.append(DetectionResult(
-            test_image=filename,
-            expected_fish=expected_fish,
-            detected_fish=detected_fish,
-            confidence=confidence,
-            detection_time_ms=detection_time,
-            correct=correct
-        ))
+    print(f"Sampled {len(results_full)}/{len(test_images)} test images (--full-sample-rate {full_sample_rate:g})\n")
     
     # Print results without cropping
-    print(f"{'Test Image':<45} | {'Expected':<25} | {'Detected':<25} | {'Score':>8} | {'Time (ms)':>10}")
-    print("-" * 125)
+    # Render the table into a buffer and write it to stdout in one call
+    buf = io.StringIO()
+    buf.write(f"{'Test Image':<45} | {'Expected':<25} | {'Detected':<25} | {'Score':>8} | {'Time (ms)':>10}\n")
+    buf.write("-" * 125 + "\n")
     
     correct_count_full = 0
     total_time_full = 0.0
@@ -287,7 +758,7 @@ def run_benchmark():
         status = "✓" if result.correct else "✗"
         detected = result.detected_fish or "NONE"
         
-        print(f"{status} {result.test_image:<42} | {result.expected_fish:<25} | {detected:<25} | {result.confidence:>7.3f} | {result.detection_time_ms:>10.2f}")
+        buf.write(f"{status} {result.test_image:<42} | {result.expected_fish:<25} | {detected:<25} | {result.confidence:>7.3f} | {result.detection_time_ms:>10.2f}\n")
         
         if result.correct:
             correct_count_full += 1
@@ -296,17 +767,26 @@ def run_benchmark():
     accuracy_full = (correct_count_full / len(results_full)) * 100 if results_full else 0
     avg_time_full = total_time_full / len(results_full) if results_full else 0
     
-    print(f"\n{'=' * 125}")
-    print("RESULTS WITHOUT CROPPING (FULL IMAGE):")
-    print(f"  Accuracy: {correct_count_full}/{len(results_full)} ({accuracy_full:.1f}%)")
-    print(f"  Average detection time: {avg_time_full:.2f}ms")
-    print(f"  Total detection time: {total_time_full:.2f}ms")
+    buf.write(f"\n{'=' * 125}\n")
+    buf.write("RESULTS WITHOUT CROPPING (FULL IMAGE):\n")
+    buf.write(f"  Accuracy: {correct_count_full}/{len(results_full)} ({accuracy_full:.1f}%)\n")
+    buf.write(f"  Average detection time: {avg_time_full:.2f}ms\n")
+    buf.write(f"  Total detection time: {total_time_full:.2f}ms\n")
+    sys.stdout.write(buf.getvalue())
+    sys.stdout.flush()
+    
+    # Compare accuracy on the sampled images only, so both columns cover the same tests
+    sampled_images = {result.test_image for result in results_full}
+    sampled_cropped = [r for r in results_cropped if r.test_image in sampled_images]
+    sampled_correct = sum(1 for r in sampled_cropped if r.correct)
+    accuracy_sampled = (sampled_correct / len(sampled_cropped)) * 100 if sampled_cropped else 0
     
     # Compare results
     print("\n\n========== COMPARISON ==========\n")
+    print(f"(accuracy compared on the {len(results_full)} images run both ways)\n")
     print("                    | WITH CROPPING | WITHOUT CROPPING | DIFFERENCE")
     print("-" * 75)
-    print(f"Accuracy            | {accuracy:>12.1f}% | {accuracy_full:>15.1f}% | {accuracy - accuracy_full:>+10.1f}%")
+    print(f"Accuracy            | {accuracy_sampled:>12.1f}% | {accuracy_full:>15.1f}% | {accuracy_sampled - accuracy_full:>+10.1f}%")
     print(f"Avg Detection Time  | {avg_time:>11.2f}ms | {avg_time_full:>14.2f}ms | {avg_time - avg_time_full:>+10.2f}ms")
     
     # Summary and recommendations
@@ -319,7 +799,7 @@ def run_benchmark():
     else:
         print(f"✗ Detection accuracy with cropping is LOW ({accuracy:.1f}%), needs tuning")
     
-    if accuracy_full > accuracy:
+    if accuracy_full > accuracy_sampled:
         print("⚠ Full image detection has higher accuracy - consider adjusting crop region")
         print("  Suggestion: Try different FISH_CROP_* constants")
     
@@ -349,5 +829,23 @@ def run_benchmark():
     return accuracy, accuracy_full
 
 
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark fish detection on the test images")
+    parser.add_argument(
+        '--full-sample-rate',
+        type=float,
+        default=DEFAULT_FULL_SAMPLE_RATE,
+        metavar='RATE',
+        help=f'Fraction of test images also run without cropping, from 0 to 1 (default: {DEFAULT_FULL_SAMPLE_RATE})'
+    )
+    
+    args = parser.parse_args()
+    
+    if not 0.0 <= args.full_sample_rate <= 1.0:
+        parser.error(f"--full-sample-rate must be between 0 and 1, got {args.full_sample_rate}")
+    
+    run_benchmark(full_sample_rate=args.full_sample_rate)
+
+
 if __name__ == "__main__":
-    run_benchmark()
+    main()